@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-stream vs parallel byte-range downloads against a local HTTP stand-in.
+
+The local server throttles each connection (like a CDN does) so the benefit of
+several concurrent ranges shows up without touching the network.
+
+With --cache-url it also measures the persistent yt-dlp cache: extraction of that
+(YouTube) URL with an empty cache directory vs. a warm one. This one needs network.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+import aiohttp
+import aiofiles
+from aiohttp import web
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import yt_dlp
+from whatsapp_bot import (RangeDownloader, SharedYoutubeDL, get_parallel_download_opts, ensure_directories,
+                          ytdlp_cache_stats)
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8799
+WRITE_SIZE = 64 * 1024
+
+def create_app(payload: bytes, rate: float) -> web.Application:
+    """Serve payload at /media.mp4 (with Range support) and /noranges.mp4 (without), capped at rate bytes/s per connection"""
+
+    async def stream(request: web.Request, start: int, end: int, status: int, headers: dict) -> web.StreamResponse:
+        response = web.StreamResponse(status=status, headers={
+            'Content-Type': 'video/mp4',
+            'Content-Length': str(end - start + 1),
+            **headers,
+        })
+        await response.prepare(request)
+        offset = start
+        try:
+            while offset <= end:
+                chunk = payload[offset:min(offset + WRITE_SIZE, end + 1)]
+                await response.write(chunk)
+                offset += len(chunk)
+                await asyncio.sleep(len(chunk) / rate)
+        except ConnectionResetError:
+            pass  # Client stopped reading early (yt-dlp probes the URL before downloading)
+        return response
+
+    async def ranged(request: web.Request):
+        total = len(payload)
+        range_header = request.headers.get('Range')
+        if not range_header:
+            return await stream(request, 0, total - 1, 200, {'Accept-Ranges': 'bytes'})
+        start_str, end_str = range_header.replace('bytes=', '').split('-')
+        start = int(start_str)
+        end = min(int(end_str) if end_str else total - 1, total - 1)
+        return await stream(request, start, end, 206, {'Content-Range': f'bytes {start}-{end}/{total}'})
+
+    async def unranged(request: web.Request):
+        return await stream(request, 0, len(payload) - 1, 200, {})
+
+    app = web.Application()
+    app.router.add_get('/media.mp4', ranged)
+    app.router.add_get('/noranges.mp4', unranged)
+    return app
+
+async def single_stream_download(url: str, file_path: str):
+    """The previous download_direct_media loop: one connection, 8KB reads"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            async with aiofiles.open(file_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(8192):
+                    await f.write(chunk)
+
+def ytdlp_download(url: str, file_path: str, parallel: bool):
+    """Download a direct URL through yt-dlp with its native or the parallel downloader"""
+    ydl_opts = {'outtmpl': file_path, 'quiet': True, 'no_warnings': True, 'noprogress': True}
+    if parallel:
+        ydl_opts.update(get_parallel_download_opts())
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([url])
+
+async def timed(label: str, payload: bytes, runs: int, download) -> float:
+    """Run download(file_path) runs times, verify the bytes and print the best time"""
+    best = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for run in range(runs):
+            file_path = os.path.join(temp_dir, f"run{run}.mp4")
+            started = time.time()
+            await download(file_path)
+            elapsed = time.time() - started
+            with open(file_path, 'rb') as f:
+                if f.read() != payload:
+                    print(f"❌ {label}: downloaded bytes do not match")
+                    return 0.0
+            best = elapsed if best is None else min(best, elapsed)
+
+    size_mb = len(payload) / (1024 * 1024)
+    print(f"  {label:<34} {best:6.2f}s  {size_mb / best:7.1f} MB/s")
+    return best
+
+async def run_benchmark(size_mb: int, rate_mb: float, runs: int):
+    """Start the stand-in server and compare the download paths"""
+    payload = os.urandom(size_mb * 1024 * 1024)
+    runner = web.AppRunner(create_app(payload, rate_mb * 1024 * 1024))
+    await runner.setup()
+    await web.TCPSite(runner, SERVER_HOST, SERVER_PORT).start()
+
+    base = f"http://{SERVER_HOST}:{SERVER_PORT}"
+    downloader = RangeDownloader()
+
+    print(f"🚀 {size_mb}MB file, {rate_mb}MB/s per connection, best of {runs}")
+    print("=" * 60)
+    try:
+        single = await timed("aiohttp single stream (old)", payload, runs,
+                             lambda path: single_stream_download(f"{base}/media.mp4", path))
+        parallel = await timed(f"RangeDownloader ({downloader.connections} conns)", payload, runs,
+                               lambda path: downloader.download(f"{base}/media.mp4", path))
+        await timed("RangeDownloader, no range support", payload, runs,
+                    lambda path: downloader.download(f"{base}/noranges.mp4", path))
+        native = await timed("yt-dlp native", payload, runs,
+                             lambda path: asyncio.to_thread(ytdlp_download, f"{base}/media.mp4", path, False))
+        external = await timed("yt-dlp + ParallelRangeFD", payload, runs,
+                               lambda path: asyncio.to_thread(ytdlp_download, f"{base}/media.mp4", path, True))
+    finally:
+        await runner.cleanup()
+
+    print("=" * 60)
+    if single and parallel:
+        print(f"⚡ Direct media speedup: {single / parallel:.1f}x")
+    if native and external:
+        print(f"⚡ yt-dlp speedup: {native / external:.1f}x")
+
+def cached_extraction(url: str, cachedir: str):
+    """Extract url with the bot's YoutubeDL on cachedir; returns (seconds, cache hits, cache misses)"""
+    hits = sum(counts['hits'] for counts in ytdlp_cache_stats.values())
+    misses = sum(counts['misses'] for counts in ytdlp_cache_stats.values())
+    started = time.time()
+    with SharedYoutubeDL({'quiet': True, 'no_warnings': True, 'skip_download': True, 'cachedir': cachedir}) as ydl:
+        ydl.extract_info(url, download=False)
+    elapsed = time.time() - started
+    return (elapsed, sum(counts['hits'] for counts in ytdlp_cache_stats.values()) - hits,
+            sum(counts['misses'] for counts in ytdlp_cache_stats.values()) - misses)
+
+def run_cache_benchmark(url: str, runs: int):
+    """Compare extraction with a cold and a warm yt-dlp cache directory"""
+    print(f"🗄️  yt-dlp cache: {url}, best warm run of {runs}")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as cachedir:
+        cold, hits, misses = cached_extraction(url, cachedir)
+        print(f"  {'cold cache':<34} {cold:6.2f}s  {hits} hits / {misses} misses")
+        warm_runs = [cached_extraction(url, cachedir) for _ in range(runs)]
+        warm, hits, misses = min(warm_runs)
+        print(f"  {'warm cache':<34} {warm:6.2f}s  {hits} hits / {misses} misses")
+    print("=" * 60)
+    print(f"⚡ Warm cache saves {cold - warm:.2f}s per cold extraction")
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=32, help="File size in MB")
+    parser.add_argument('--rate', type=float, default=8.0, help="Per-connection cap in MB/s")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per downloader (best is reported)")
+    parser.add_argument('--cache-url', help="Also measure cold vs warm yt-dlp cache extraction of this URL (needs network)")
+    args = parser.parse_args()
+
+    ensure_directories()
+    asyncio.run(run_benchmark(args.size, args.rate, args.runs))
+    if args.cache_url:
+        print()
+        run_cache_benchmark(args.cache_url, args.runs)
+
+if __name__ == "__main__":
+    main()
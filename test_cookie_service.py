@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared cookie jars: lease a private copy, merge its changes back
+"""
+import os
+import sys
+import tempfile
+import http.cookiejar
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from whatsapp_bot import CookieService
+
+COOKIES = """# Netscape HTTP Cookie File
+.instagram.com\tTRUE\t/\tTRUE\t2000000000\tsessionid\told-session
+.instagram.com\tTRUE\t/\tTRUE\t2000000000\tcsrftoken\told-csrf
+.instagram.com\tTRUE\t/\tTRUE\t2000000000\tds_user_id\t12345
+"""
+
+def make_cookie(name: str, value: str) -> http.cookiejar.Cookie:
+    """A cookie on .instagram.com, as yt-dlp would set it from a response"""
+    return http.cookiejar.Cookie(
+        0, name, value, None, False, '.instagram.com', True, True, '/', True,
+        True, 2000000000, False, None, None, {})
+
+def write_cookie_file() -> str:
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(fd, 'w') as f:
+        f.write(COOKIES)
+    return path
+
+def values(jar) -> dict:
+    return {cookie.name: cookie.value for cookie in jar}
+
+def test_lease_is_private_copy():
+    """A run refreshing a cookie in its lease must not touch the shared jar"""
+    path = write_cookie_file()
+    try:
+        service = CookieService()
+        jar, base = service.lease(path)
+        jar.set_cookie(make_cookie('sessionid', 'new-session'))
+        shared = service.jars[os.path.abspath(path)]['jar']
+        assert values(shared)['sessionid'] == 'old-session'
+        assert set(base) == {('.instagram.com', '/', name) for name in ('sessionid', 'csrftoken', 'ds_user_id')}
+        # The second lease reuses the parsed jar
+        service.lease(path)
+        assert service.parses == 1 and service.leases == 2
+        print("✅ Lease is a private copy")
+    finally:
+        os.remove(path)
+
+def test_merge_changed_and_removed():
+    """Refreshed, added and dropped cookies all reach the shared jar and the file on flush"""
+    path = write_cookie_file()
+    try:
+        service = CookieService()
+        jar, base = service.lease(path)
+        jar.set_cookie(make_cookie('sessionid', 'new-session'))
+        jar.set_cookie(make_cookie('rur', 'added'))
+        jar.clear('.instagram.com', '/', 'csrftoken')
+        service.merge(path, jar, base)
+
+        entry = service.jars[os.path.abspath(path)]
+        assert entry['dirty']
+        assert values(entry['jar']) == {'sessionid': 'new-session', 'ds_user_id': '12345', 'rur': 'added'}
+        assert service.merged_cookies == 3
+
+        service.flush()
+        assert not entry['dirty'] and service.flushes == 1
+        with open(path) as f:
+            content = f.read()
+        assert 'new-session' in content and 'added' in content and 'old-csrf' not in content
+        print("✅ Changed and removed cookies merged and flushed")
+    finally:
+        os.remove(path)
+
+def test_merge_unchanged_is_noop():
+    """A run that changed nothing leaves the jar clean, so nothing gets rewritten"""
+    path = write_cookie_file()
+    try:
+        service = CookieService()
+        jar, base = service.lease(path)
+        service.merge(path, jar, base)
+        assert not service.jars[os.path.abspath(path)]['dirty']
+        assert service.merged_cookies == 0
+        print("✅ Unchanged lease merges nothing")
+    finally:
+        os.remove(path)
+
+def test_merge_after_file_swapped_out():
+    """Changes from a run on a file that was swapped out (forgotten) are dropped"""
+    path = write_cookie_file()
+    try:
+        service = CookieService()
+        jar, base = service.lease(path)
+        service.forget(path)
+        jar.set_cookie(make_cookie('sessionid', 'stale-login'))
+        service.merge(path, jar, base)
+        assert os.path.abspath(path) not in service.jars
+        assert service.merged_cookies == 0
+
+        # A fresh lease re-parses the file, which still has the old cookies
+        fresh, _ = service.lease(path)
+        assert values(fresh)['sessionid'] == 'old-session' and service.parses == 2
+        print("✅ Merge into a swapped-out file is dropped")
+    finally:
+        os.remove(path)
+
+def main():
+    """Main test function"""
+    print("🧪 WhatsApp Bot Cookie Service Test")
+    print("=" * 35)
+
+    test_lease_is_private_copy()
+    test_merge_changed_and_removed()
+    test_merge_unchanged_is_noop()
+    test_merge_after_file_swapped_out()
+
+    print("\n" + "=" * 35)
+    print("Test completed!")
+
+if __name__ == "__main__":
+    main()